@@ -0,0 +1,60 @@
+# Measures how long it takes to import xemapytools modules in a fresh
+# interpreter, and whether pandas/numpy end up fully loaded.
+#
+# Usage (from the repository root, with the package installed or with src on the path):
+#   pip install -e .  &&  python benchmarks/import_time.py [--repeat N]
+#   PYTHONPATH=src python benchmarks/import_time.py [--repeat N]
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+TARGETS = [
+    ("import xemapytools", ""),
+    ("import xemapytools.resources.url_list", ""),
+    ("import xemapytools.data_download", ""),
+    ("import xemapytools.main_functions", ""),
+    ("import xemapytools.data_download", "xemapytools.data_download.build_soql_where_clause({'codi_estacio': 'V4'})"),
+    ("import pandas", ""),
+]
+
+# Prints the elapsed import time and which heavy modules were actually executed
+_SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+{statement}
+{usage}
+elapsed = time.perf_counter() - t0
+loaded = [m for m in ("numpy", "pandas") if any(k.startswith(m + ".") for k in sys.modules)]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(statement: str, usage: str, repeat: int):
+    times, loaded = [], ""
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _SNIPPET.format(statement=statement, usage=usage)],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        loaded = out[1] if len(out) > 1 else "-"
+    return statistics.median(times), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark xemapytools import time")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per target (median is reported)")
+    args = parser.parse_args()
+
+    print(f"{'target':<95}  {'median ms':>9}  heavy modules loaded")
+    print("-" * 130)
+    for statement, usage in TARGETS:
+        label = statement + (f"; {usage}" if usage else "")
+        median, loaded = measure(statement, usage, args.repeat)
+        print(f"{label:<95}  {median * 1000:9.1f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
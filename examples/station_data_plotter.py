@@ -6,6 +6,7 @@ import pandas as pd
 import xemapytools.main_functions as xptmf
 import xemapytools.data_treatment as xptdt
 import xemapytools.data_download as xptdd
+import xemapytools.metadata_registry as xptmr
 from xemapytools.resources import url_list, XEMA_standards
 
 logging.basicConfig(level=logging.INFO)
@@ -24,8 +25,8 @@ else:
         "stations_raw": BASE_DIR / "stations_raw_metadata.csv",
         "variables_raw": BASE_DIR / "variables_raw_metadata.csv",
     }
-stations_metadata = xptdt.load_local_csv_as_dataframe(paths["stations_raw"])
-variables_metadata = xptdt.load_local_csv_as_dataframe(paths["variables_raw"])
+# Reference metadata is loaded once and reloaded only if the files change
+metadata = xptmr.get_metadata_registry(paths)
 
 if DOWNLOAD_WEATHER_DATA:
     filters = {
@@ -52,30 +53,21 @@ stdz_data = xptdt.standardize_dataframe(
     XEMA_standards.WEATHER_DATA_STANDARD_COLTOAPI_MAPPING
 )
 
-# Load variables metadata again and standardize
-variables_metadata = xptdt.load_local_csv_as_dataframe("data_store/variables_raw_metadata.csv")
-variables_metadata = xptdt.standardize_dataframe(
-    variables_metadata,
-    XEMA_standards.VARIABLES_STANDARD_DTYPES_MAPPING,
-    XEMA_standards.VARIABLES_STANDARD_COLTOAPI_MAPPING
-)
-
-# Map original variable codes to their readable names
-variable_map = dict(zip(variables_metadata['codi_variable'], variables_metadata['nom_variable']))
-stdz_data['variable_name'] = stdz_data['codi_variable'].map(variable_map)
+# Add readable variable names from the metadata registry
+stdz_data = metadata.enrich_readings(stdz_data, station_columns=[], variable_columns=['nom_variable'])
 
 # --- Data Visualization ---
 fig = px.line(
     stdz_data,
     x='data_lectura',
     y='valor_lectura',
-    color='variable_name',
+    color='nom_variable',
     line_group='codi_estacio',
     title='Weather Measurements Over Time',
     labels={
         'data_lectura': 'Date',
         'valor_lectura': 'Value',
-        'variable_name': 'Variable',
+        'nom_variable': 'Variable',
         'codi_estacio': 'Station'
     }
 )
@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 import xemapytools.main_functions as xptmf
 import xemapytools.data_treatment as xptdt
 import xemapytools.data_download as xptdd
+import xemapytools.metadata_registry as xptmr
 from xemapytools.resources import url_list, XEMA_standards
 
 def imprimir_estacions(df: pd.DataFrame):
@@ -77,8 +78,9 @@ def main():
     parser.add_argument("--radi", type=float, required=True, help="Radi en km per filtrar les estacions")
     args = parser.parse_args()
 
-    # 1) Carregar dades (fitxer separat)
-    df = xptdt.load_local_csv_as_dataframe("data_store/stations_raw_metadata.csv")
+    # 1) Carregar dades del registre de metadades (es carreguen un sol cop)
+    #    reset_index() recupera la columna codi_estacio
+    df = xptmr.get_metadata_registry("data_store").stations.reset_index()
 
     # 2) Filtrar per radi (fa servir la distància importada a data_xema)
     estacions_filtrades = xptmf.get_stations_by_radius(args.lat, args.lon, args.radi, df)
@@ -1,4 +1,30 @@
 # src/xemapytools/__init__.py
 
+import importlib
+
 # It's good practice to import __version__ here
-__version__ = "1.1.0" # Make sure this matches your pyproject.toml
\ No newline at end of file
+__version__ = "1.1.0" # Make sure this matches your pyproject.toml
+
+# Submodules are imported on first access (e.g. `xemapytools.data_download`),
+# so `import xemapytools` does not load pandas or numpy.
+_SUBMODULES = {
+    "batch_conversion",
+    "data_download",
+    "data_quality",
+    "data_treatment",
+    "main_functions",
+    "metadata_registry",
+    "resources",
+    "spatial_interpolation",
+    "timeseries_archive",
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
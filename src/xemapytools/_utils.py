@@ -6,7 +6,6 @@
 #
 
 import math
-import numpy as np
 
 R_EARTH_KM = 6371.0088
 
@@ -22,3 +21,18 @@ def haversine_km(lat1, lon1, lat2, lon2):
     c = 2*math.atan2(math.sqrt(a), math.sqrt(1-a))
     return R_EARTH_KM * c
 
+
+def haversine_km_matrix(lats1, lons1, lats2, lons2):
+    """
+    Vectorized Haversine distance (in km) between every point of the first set
+    and every point of the second set. Returns an array of shape (len(lats1), len(lats2)).
+    """
+    import numpy as np
+
+    phi1 = np.radians(np.asarray(lats1, dtype=float))[:, None]
+    phi2 = np.radians(np.asarray(lats2, dtype=float))[None, :]
+    lam1 = np.radians(np.asarray(lons1, dtype=float))[:, None]
+    lam2 = np.radians(np.asarray(lons2, dtype=float))[None, :]
+    a = np.sin((phi2 - phi1)/2)**2 + np.cos(phi1)*np.cos(phi2)*np.sin((lam2 - lam1)/2)**2
+    c = 2*np.arctan2(np.sqrt(a), np.sqrt(np.clip(1 - a, 0.0, None)))
+    return R_EARTH_KM * c
@@ -0,0 +1,209 @@
+import logging
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+
+import pandas as pd
+
+import xemapytools.data_treatment as xptdt
+
+logger = logging.getLogger(__name__)
+
+_MISSING_PARTITION_VALUE = "__null__"
+# Written into every completed output directory; only marked directories are overwritten
+_OUTPUT_MARKER_FILENAME = ".xemapytools-partitioned"
+
+
+def _partition_dirname(col: str, value) -> str:
+    if pd.isna(value):
+        value = _MISSING_PARTITION_VALUE
+    return f"{col}={str(value).replace('/', '_').replace(os.sep, '_')}"
+
+
+def _standardize_and_write_chunk(
+    chunk: pd.DataFrame,
+    standard_dtype_map: Optional[xptdt.StandardMap],
+    standard_coltoapi_map: Optional[Dict[str, str]],
+    output_dir: Path,
+    partition_by: Sequence[str],
+    part_name: str,
+) -> List[Path]:
+    """
+    Standardize one chunk and write it as one CSV file per partition.
+    Runs inside a worker process.
+    """
+    stdz = xptdt.standardize_dataframe(chunk, standard_dtype_map, standard_coltoapi_map)
+
+    missing = [col for col in partition_by if col not in stdz.columns]
+    if missing:
+        raise KeyError(f"Partition columns not found after standardization: {missing}")
+
+    written: List[Path] = []
+    if not partition_by:
+        path = output_dir / f"{part_name}.csv"
+        stdz.to_csv(path, index=False)
+        return [path]
+
+    for key, part in stdz.groupby(list(partition_by), dropna=False, sort=False):
+        key = key if isinstance(key, tuple) else (key,)
+        part_dir = output_dir.joinpath(*(_partition_dirname(c, v) for c, v in zip(partition_by, key)))
+        part_dir.mkdir(parents=True, exist_ok=True)
+        path = part_dir / f"{part_name}.csv"
+        part.drop(columns=list(partition_by)).to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
+def convert_csv_files_partitioned(
+    input_paths: Union[Path, str, Iterable[Union[Path, str]]],
+    output_dir: Union[Path, str],
+    standard_dtype_map: Optional[xptdt.StandardMap] = None,
+    standard_coltoapi_map: Optional[Dict[str, str]] = None,
+    partition_by: Sequence[str] = ("codi_estacio",),
+    chunksize: int = 200_000,
+    max_workers: Optional[int] = None,
+    overwrite: bool = True,
+) -> List[Path]:
+    """
+    Standardize large local CSV files chunk by chunk across a process pool and
+    write the result as partitioned CSVs (`output_dir/<col>=<value>/<part>.csv`).
+
+    Args:
+        input_paths: One CSV path or an iterable of CSV paths.
+        output_dir: Root directory of the partitioned output.
+        standard_dtype_map / standard_coltoapi_map: Passed to standardize_dataframe(),
+            e.g. the `XEMA_standards` mappings.
+        partition_by: Standardized column names used to partition the output.
+            Partition columns are encoded in the directory names, not in the files.
+        chunksize: Number of rows read per chunk. Bounds the memory of each task.
+        max_workers: Number of worker processes (defaults to the CPU count).
+            With max_workers=1 chunks are processed in the calling process.
+        overwrite: If True, a previous output of this function in output_dir is
+            replaced once the conversion succeeds. Raises FileExistsError when
+            output_dir is not empty and either overwrite=False or it was not
+            written by this function.
+
+    Returns:
+        List[Path]: Paths of all written CSV files.
+
+    Note: when using a process pool on platforms that spawn workers (Windows, macOS),
+    call this function under an `if __name__ == "__main__":` guard.
+    """
+    if isinstance(input_paths, (str, Path)):
+        input_paths = [input_paths]
+    input_paths = [Path(p) for p in input_paths]
+    for path in input_paths:
+        if not path.exists():
+            logger.error(f"CSV file not found: {path}")
+            raise FileNotFoundError(f"CSV file not found: {path}")
+
+    out = Path(output_dir)
+    if out.exists() and any(out.iterdir()):
+        if not overwrite:
+            raise FileExistsError(f"{out} is not empty and overwrite=False.")
+        if not (out / _OUTPUT_MARKER_FILENAME).exists():
+            raise FileExistsError(
+                f"{out} is not empty and was not written by convert_csv_files_partitioned(); "
+                f"refusing to overwrite it."
+            )
+    for path in input_paths:
+        if out.resolve() in path.resolve().parents:
+            raise ValueError(f"Input file {path} is inside output_dir {out}.")
+
+    # Write into a temporary sibling directory and swap it in at the end, so
+    # stale part files from earlier runs never mix with the new output
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.parent / f".{out.name}.tmp-{os.getpid()}"
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir()
+
+    partition_by = tuple(partition_by)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    def chunks():
+        for n, path in enumerate(input_paths):
+            logger.info(f"Reading {path} in chunks of {chunksize} rows")
+            # Read everything as text so every chunk is typed identically by the dtype map
+            reader = pd.read_csv(path, chunksize=chunksize, dtype=str)
+            for i, chunk in enumerate(reader):
+                # The input ordinal keeps part names unique for inputs sharing a file name
+                yield chunk, f"{n:04d}-{path.stem}-{i:05d}"
+
+    written: List[Path] = []
+    task_args = (standard_dtype_map, standard_coltoapi_map, tmp, partition_by)
+
+    try:
+        if max_workers == 1:
+            for chunk, part_name in chunks():
+                written.extend(_standardize_and_write_chunk(chunk, *task_args, part_name))
+        else:
+            # Keep a bounded number of chunks in flight so memory stays bounded
+            max_pending = 2 * max_workers
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                pending: Set[Future] = set()
+                for chunk, part_name in chunks():
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            written.extend(future.result())
+                    pending.add(executor.submit(_standardize_and_write_chunk, chunk, *task_args, part_name))
+                for future in wait(pending).done:
+                    written.extend(future.result())
+        (tmp / _OUTPUT_MARKER_FILENAME).touch()
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    # out is either empty or a marked previous output at this point
+    if out.exists():
+        shutil.rmtree(out)
+    tmp.rename(out)
+    written = [out / path.relative_to(tmp) for path in written]
+
+    logger.info(f"Converted {len(input_paths)} CSV files into {len(written)} partition files under {out}")
+    return written
+
+
+def load_partitioned_csv_as_dataframe(
+    base_dir: Union[Path, str],
+    standard_dtype_map: Optional[xptdt.StandardMap] = None,
+    **partition_filters,
+) -> pd.DataFrame:
+    """
+    Load the output of convert_csv_files_partitioned() back into a DataFrame,
+    restoring the partition columns. Keyword arguments select partitions,
+    e.g. `codi_estacio="V4"` or `codi_estacio=["V4", "YH"]`.
+    If a dtype map is given, columns are re-typed with standardize_dataframe().
+    """
+    base = Path(base_dir)
+    if not base.exists():
+        logger.error(f"Partitioned directory not found: {base}")
+        raise FileNotFoundError(f"Partitioned directory not found: {base}")
+
+    allowed = {
+        col: {str(v) for v in (vals if isinstance(vals, (list, tuple, set)) else [vals])}
+        for col, vals in partition_filters.items()
+    }
+
+    frames = []
+    for path in sorted(base.rglob("*.csv")):
+        parts = dict(p.split("=", 1) for p in path.relative_to(base).parts[:-1] if "=" in p)
+        if any(parts.get(col) not in vals for col, vals in allowed.items()):
+            continue
+        df = pd.read_csv(path, dtype=str)
+        for col, value in parts.items():
+            df[col] = None if value == _MISSING_PARTITION_VALUE else value
+        frames.append(df)
+
+    if not frames:
+        logger.warning(f"No partition files matched under {base}. Returning empty DataFrame.")
+        return pd.DataFrame()
+
+    result = pd.concat(frames, ignore_index=True)
+    if standard_dtype_map:
+        result = xptdt.standardize_dataframe(result, standard_dtype_map)
+    logger.info(f"Loaded {len(result)} rows from {len(frames)} partition files under {base}")
+    return result
@@ -1,13 +1,18 @@
-import urllib.request
+from __future__ import annotations
+
 import urllib.parse
-import pandas as pd
 import io
 import gzip
 import zlib
 import logging
-from typing import Optional, Dict, Tuple, Union, List
+from typing import TYPE_CHECKING, Optional, Dict, Tuple, Union, List
 from datetime import datetime
 
+# pandas and urllib.request are only needed to fetch data, not to build
+# queries, so they are imported inside the functions that use them
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +25,9 @@ def download_simple_csv_from_url_as_dataframe(
     Download a CSV from the given URL using urllib and return a pandas DataFrame.
     Handles gzip/deflate response encoding if present.
     """
+    import urllib.request
+    import pandas as pd
+
     req = urllib.request.Request(url)
     if headers:
         for k, v in headers.items():
@@ -58,7 +66,8 @@ def download_simple_csv_from_url_as_dataframe(
 
 # Constants for datetime columns and formats
 _DATETIME_SOURCE_COLUMNS = {"data_lectura", "data_extrem"}
-_DATETIME_INPUT_FORMAT = "%d/%m/%Y %I:%M:%S %p"
+# Format of the datetime values given in filters for data_lectura / data_extrem
+DATETIME_FILTER_FORMAT = "%d/%m/%Y %I:%M:%S %p"
 _DATETIME_SOQL_FORMAT = "%Y-%m-%dT%H:%M:%S"
 
 Condition = Union[
@@ -96,11 +105,11 @@ def build_soql_where_clause(
         try:
             if isinstance(c_val, tuple):
                 op, v_str = c_val
-                dt_obj = datetime.strptime(v_str, _DATETIME_INPUT_FORMAT)
+                dt_obj = datetime.strptime(v_str, DATETIME_FILTER_FORMAT)
                 soql_dt_str = dt_obj.strftime(_DATETIME_SOQL_FORMAT)
                 return f"{col} {op} '{soql_dt_str}'"
             else:
-                dt_obj = datetime.strptime(str(c_val), _DATETIME_INPUT_FORMAT)
+                dt_obj = datetime.strptime(str(c_val), DATETIME_FILTER_FORMAT)
                 soql_dt_str = dt_obj.strftime(_DATETIME_SOQL_FORMAT)
                 return f"{col} = '{soql_dt_str}'"
         except ValueError as e:
@@ -159,6 +168,10 @@ def fetch_socrata_csv_with_filters(
     Fetch CSV from Socrata using filters, returning a pandas DataFrame.
     Handles pagination with $limit and $offset.
     """
+    import urllib.error
+    import urllib.request
+    import pandas as pd
+
     headers = {
         "User-Agent": "python-urllib/3.x",
     }
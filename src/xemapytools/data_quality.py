@@ -0,0 +1,440 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import xemapytools.data_download as xptdd
+
+logger = logging.getLogger(__name__)
+
+_KEYS = ["codi_estacio", "codi_variable"]
+
+CadenceSpec = Union[str, pd.Timedelta, Dict[str, Union[str, pd.Timedelta]]]
+LimitsSpec = Dict[str, Tuple[Optional[float], Optional[float]]]
+ThresholdSpec = Union[float, Dict[str, float]]
+
+_EMPTY_COLUMNS = {
+    "gaps": _KEYS + ["start", "end", "n_missing"],
+    "stuck": _KEYS + ["start", "end", "n_readings", "valor_lectura"],
+    "out_of_range": _KEYS + ["start", "end", "n_readings", "min", "max"],
+    "spikes": _KEYS + ["data_lectura", "valor_lectura", "deviation"],
+}
+
+
+class _ConstantCadence(dict):
+    """Cadence mapping that returns the same interval for every variable."""
+
+    def __init__(self, cadence: pd.Timedelta):
+        super().__init__()
+        self.cadence = cadence
+
+    def __missing__(self, key):
+        return self.cadence
+
+
+def _normalize(
+    df: pd.DataFrame,
+    value_col: str,
+    time_col: str,
+) -> pd.DataFrame:
+    """Reduce readings to the key, time and value columns used by the checks."""
+    data = pd.DataFrame({
+        "codi_estacio": df["codi_estacio"].astype(str).to_numpy(),
+        "codi_variable": df["codi_variable"].astype(str).to_numpy(),
+        "t": pd.to_datetime(df[time_col], utc=True, errors="coerce").reset_index(drop=True),
+        "v": pd.to_numeric(df[value_col], errors="coerce").to_numpy(dtype=float),
+        "_new": True,
+    })
+    return data[data["t"].notna()]
+
+
+def _infer_cadence(data: pd.DataFrame) -> Dict[str, pd.Timedelta]:
+    data = data.sort_values(_KEYS + ["t"], kind="stable")
+    diffs = data.groupby(_KEYS, sort=False)["t"].diff()
+    positive = diffs > pd.Timedelta(0)
+    return diffs[positive].groupby(data.loc[positive, "codi_variable"]).median().to_dict()
+
+
+def infer_cadence(
+    df: pd.DataFrame,
+    time_col: str = "data_lectura",
+) -> Dict[str, pd.Timedelta]:
+    """
+    Infer the expected cadence of each codi_variable as the median positive
+    interval between consecutive readings of the same station.
+    """
+    data = _normalize(df.assign(_v=np.nan), "_v", time_col)
+    return _infer_cadence(data)
+
+
+def _per_row(spec, variables: pd.Series, dtype=float) -> pd.Series:
+    """Broadcast a scalar or a per-codi_variable dict to one value per row."""
+    if isinstance(spec, dict):
+        return variables.map(spec).astype(dtype)
+    return pd.Series(spec, index=variables.index, dtype=dtype)
+
+
+def _process(
+    data: pd.DataFrame,
+    final: bool,
+    cadence: Optional[Dict[str, pd.Timedelta]],
+    limits: Optional[LimitsSpec],
+    stuck_min_run: Optional[int],
+    stuck_tolerance: float,
+    spike_threshold: Optional[ThresholdSpec],
+    spike_window: int,
+) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Run all enabled checks on one block of rows (carried rows + new chunk).
+
+    Rows at the end of each series whose result could still change with the
+    next chunk (open runs, spikes without right-hand context) are not emitted
+    but returned as carry, together with the left context spikes need.
+    `_new` marks rows whose issues have not been emitted yet.
+    """
+    data = data.sort_values(_KEYS + ["t"], kind="stable", ignore_index=True)
+    g = data.groupby(_KEYS, sort=False).ngroup()
+    pos = data.groupby(g).cumcount()
+    size = g.map(g.value_counts())
+    same_prev = g.eq(g.shift(1))
+    t, v, new = data["t"], data["v"], data["_new"]
+
+    half = spike_window // 2 if spike_threshold is not None else 0
+    runs: Dict[str, Tuple[pd.Series, pd.Series]] = {}
+
+    if stuck_min_run is not None:
+        eq_prev = same_prev & ((v - v.shift(1)).abs() <= stuck_tolerance)
+        rid = (~eq_prev).cumsum()
+        runs["stuck"] = (rid, pd.Series(True, index=data.index))
+
+    if limits is not None:
+        lo = _per_row({k: l for k, (l, _) in limits.items()}, data["codi_variable"])
+        hi = _per_row({k: h for k, (_, h) in limits.items()}, data["codi_variable"])
+        flag = (v < lo) | (v > hi)
+        rid = (flag & ~(flag.shift(1, fill_value=False) & same_prev)).cumsum()
+        runs["out_of_range"] = (rid, flag)
+
+    # Commit boundary per row's series: rows with pos < boundary are final
+    if final:
+        boundary = size.copy()
+    else:
+        boundary = (size - half).clip(lower=0)
+        boundary = np.minimum(boundary, size - 1).astype("int64")
+        while True:
+            previous = boundary
+            for rid, flag in runs.values():
+                first_pos = pos.groupby(rid).transform("first")
+                straddle = flag & (first_pos < boundary) & (pos >= boundary)
+                open_at_end = flag & (pos == size - 1)
+                move = first_pos.where(straddle | open_at_end).groupby(g).transform("min")
+                boundary = np.minimum(boundary, move.fillna(boundary)).astype("int64")
+            if boundary.equals(previous):
+                break
+    committed = pos < boundary
+
+    results: Dict[str, pd.DataFrame] = {}
+
+    if cadence is not None:
+        cad = pd.to_timedelta(data["codi_variable"].map(cadence))
+        next_t = t.shift(-1).where(g.eq(g.shift(-1)))
+        diff = next_t - t
+        n_missing = np.ceil(diff / cad) - 1
+        mask = new & committed & (n_missing >= 1)
+        results["gaps"] = pd.DataFrame({
+            "codi_estacio": data.loc[mask, "codi_estacio"],
+            "codi_variable": data.loc[mask, "codi_variable"],
+            "start": (t + cad)[mask],
+            "end": (next_t - cad)[mask],
+            "n_missing": n_missing[mask].astype("int64"),
+        })
+
+    for name, (rid, flag) in runs.items():
+        grouped = data[flag].assign(_pos=pos[flag]).groupby(rid[flag], sort=False)
+        agg = grouped.agg(
+            codi_estacio=("codi_estacio", "first"),
+            codi_variable=("codi_variable", "first"),
+            start=("t", "first"),
+            end=("t", "last"),
+            n_readings=("t", "size"),
+            _new=("_new", "first"),
+            _last_pos=("_pos", "last"),
+            _min=("v", "min"),
+            _max=("v", "max"),
+        )
+        run_boundary = boundary[flag].groupby(rid[flag], sort=False).first()
+        keep = agg["_new"] & (agg["_last_pos"] < run_boundary)
+        if name == "stuck":
+            keep &= (agg["n_readings"] >= stuck_min_run) & agg["_min"].notna()
+            agg = agg.rename(columns={"_min": "valor_lectura"})
+        else:
+            agg = agg.rename(columns={"_min": "min", "_max": "max"})
+        results[name] = agg.loc[keep, _EMPTY_COLUMNS[name]].reset_index(drop=True)
+
+    if spike_threshold is not None:
+        median = (
+            v.groupby(g).rolling(spike_window, center=True, min_periods=1).median()
+            .droplevel(0).reindex(data.index)
+        )
+        deviation = (v - median).abs()
+        mask = new & committed & (deviation > _per_row(spike_threshold, data["codi_variable"]))
+        results["spikes"] = pd.DataFrame({
+            "codi_estacio": data.loc[mask, "codi_estacio"],
+            "codi_variable": data.loc[mask, "codi_variable"],
+            "data_lectura": t[mask],
+            "valor_lectura": v[mask],
+            "deviation": deviation[mask],
+        })
+
+    carry = data[pos >= boundary - half].assign(_new=~committed)
+    return results, carry
+
+
+def _edge_gaps(
+    extents: pd.DataFrame,
+    cadence: Dict[str, pd.Timedelta],
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+) -> List[pd.DataFrame]:
+    """Leading and trailing gaps of each series against an expected window."""
+    cad = pd.to_timedelta(extents["codi_variable"].map(cadence))
+    edges = []
+    if start is not None:
+        n = np.ceil((extents["first"] - start) / cad)
+        mask = n >= 1
+        edges.append(pd.DataFrame({
+            "codi_estacio": extents.loc[mask, "codi_estacio"],
+            "codi_variable": extents.loc[mask, "codi_variable"],
+            "start": start,
+            "end": (extents["first"] - cad)[mask],
+            "n_missing": n[mask].astype("int64"),
+        }))
+    if end is not None:
+        n = np.floor((end - extents["last"]) / cad)
+        mask = n >= 1
+        edges.append(pd.DataFrame({
+            "codi_estacio": extents.loc[mask, "codi_estacio"],
+            "codi_variable": extents.loc[mask, "codi_variable"],
+            "start": (extents["last"] + cad)[mask],
+            "end": end,
+            "n_missing": n[mask].astype("int64"),
+        }))
+    return edges
+
+
+def detect_data_issues_in_chunks(
+    chunks: Iterable[pd.DataFrame],
+    expected_cadence: Optional[CadenceSpec] = "infer",
+    limits: Optional[LimitsSpec] = None,
+    stuck_min_run: Optional[int] = None,
+    stuck_tolerance: float = 0.0,
+    spike_threshold: Optional[ThresholdSpec] = None,
+    spike_window: int = 5,
+    start: Optional[Union[str, pd.Timestamp]] = None,
+    end: Optional[Union[str, pd.Timestamp]] = None,
+    value_col: str = "valor_lectura",
+    time_col: str = "data_lectura",
+) -> Dict[str, pd.DataFrame]:
+    """
+    Detect gaps and anomalies in standardized readings streamed chunk by chunk.
+    Chunks must be in chronological order for each (codi_estacio, codi_variable)
+    series; only a short tail of every series is kept between chunks.
+    With an explicit expected_cadence, results are identical to running
+    detect_data_issues() on the concatenation. With "infer", the cadence of each
+    variable is inferred from the first chunk it appears in, which can differ
+    from the cadence inferred on the whole data.
+
+    Args:
+        chunks: Iterable of standardized readings DataFrames.
+        expected_cadence: Expected interval between readings, either one value for
+            all variables, a dict per codi_variable, "infer" (per variable, from
+            the first chunk it appears in, see infer_cadence()) or None to skip
+            gap detection. Variables without a cadence are logged as a warning.
+        limits: Dict mapping codi_variable to (min, max) valid values
+            (either may be None). None skips the range check.
+        stuck_min_run: Minimum number of consecutive identical readings
+            (within stuck_tolerance) reported as a stuck sensor. None skips it.
+        spike_threshold: Absolute deviation from the centred rolling median of
+            spike_window readings above which a reading is a spike. Scalar or
+            dict per codi_variable. None skips the spike check.
+        start, end: Optional expected time window, used to report missing
+            readings before the first and after the last reading of each series.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Tables for the enabled checks among "gaps",
+        "stuck", "out_of_range" (intervals with start/end) and "spikes" (one row
+        per reading).
+    """
+    infer = isinstance(expected_cadence, str) and expected_cadence == "infer"
+    cadence: Optional[Dict[str, pd.Timedelta]] = None
+    if infer:
+        cadence = {}
+    elif isinstance(expected_cadence, dict):
+        cadence = {str(k): pd.Timedelta(c) for k, c in expected_cadence.items()}
+    elif expected_cadence is not None:
+        cadence = _ConstantCadence(pd.Timedelta(expected_cadence))
+    warned: set = set()
+    start_ts = pd.Timestamp(start) if start is not None else None
+    end_ts = pd.Timestamp(end) if end is not None else None
+    if start_ts is not None and start_ts.tzinfo is None:
+        start_ts = start_ts.tz_localize("UTC")
+    if end_ts is not None and end_ts.tzinfo is None:
+        end_ts = end_ts.tz_localize("UTC")
+
+    collected: Dict[str, List[pd.DataFrame]] = {}
+    extents: List[pd.DataFrame] = []
+    carry: Optional[pd.DataFrame] = None
+    options = dict(
+        limits=limits,
+        stuck_min_run=stuck_min_run,
+        stuck_tolerance=stuck_tolerance,
+        spike_threshold=spike_threshold,
+        spike_window=spike_window,
+    )
+
+    n_rows = 0
+    for chunk in chunks:
+        n_rows += len(chunk)
+        data = _normalize(chunk, value_col, time_col)
+        if data.empty:
+            continue
+
+        extents.append(data.groupby(_KEYS, as_index=False)["t"].agg(first="min", last="max"))
+        block = data if carry is None else pd.concat([carry, data], ignore_index=True)
+
+        if cadence is not None and not isinstance(cadence, _ConstantCadence):
+            unknown = set(block["codi_variable"].unique()) - cadence.keys()
+            if infer and unknown:
+                inferred = _infer_cadence(block[block["codi_variable"].isin(unknown)])
+                if inferred:
+                    logger.info(f"Inferred cadence per variable: {inferred}")
+                cadence.update(inferred)
+                unknown -= inferred.keys()
+            if unknown - warned:
+                logger.warning(
+                    f"No cadence for codi_variable {sorted(unknown - warned)}; "
+                    "gaps of these readings are not detected."
+                )
+                warned |= unknown
+        results, carry = _process(block, False, cadence, **options)
+        for name, table in results.items():
+            collected.setdefault(name, []).append(table)
+
+    if carry is not None and not carry.empty:
+        results, _ = _process(carry, True, cadence, **options)
+        for name, table in results.items():
+            collected.setdefault(name, []).append(table)
+
+    if cadence is not None and extents and (start_ts is not None or end_ts is not None):
+        extent = pd.concat(extents).groupby(_KEYS, as_index=False).agg(first=("first", "min"), last=("last", "max"))
+        collected.setdefault("gaps", []).extend(_edge_gaps(extent, cadence, start_ts, end_ts))
+
+    enabled = {
+        "gaps": expected_cadence is not None,
+        "stuck": stuck_min_run is not None,
+        "out_of_range": limits is not None,
+        "spikes": spike_threshold is not None,
+    }
+    output: Dict[str, pd.DataFrame] = {}
+    for name, is_enabled in enabled.items():
+        if not is_enabled:
+            continue
+        tables = [t for t in collected.get(name, []) if not t.empty]
+        if tables:
+            sort_col = "data_lectura" if name == "spikes" else "start"
+            output[name] = (
+                pd.concat(tables, ignore_index=True)
+                .sort_values(_KEYS + [sort_col], ignore_index=True)
+            )
+        else:
+            output[name] = pd.DataFrame(columns=_EMPTY_COLUMNS[name])
+
+    logger.info(
+        f"Checked {n_rows} readings: "
+        + ", ".join(f"{len(table)} {name}" for name, table in output.items())
+    )
+    return output
+
+
+def detect_data_issues(
+    df: pd.DataFrame,
+    **detection_kwargs,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Detect gaps and anomalies in a standardized readings DataFrame.
+    Keyword arguments are passed to detect_data_issues_in_chunks().
+    """
+    return detect_data_issues_in_chunks([df], **detection_kwargs)
+
+
+def find_missing_timestamps(
+    df: pd.DataFrame,
+    expected_cadence: CadenceSpec = "infer",
+    start: Optional[Union[str, pd.Timestamp]] = None,
+    end: Optional[Union[str, pd.Timestamp]] = None,
+    time_col: str = "data_lectura",
+) -> pd.DataFrame:
+    """Return the gaps of every series as intervals of missing timestamps."""
+    return detect_data_issues(
+        df, expected_cadence=expected_cadence, start=start, end=end, time_col=time_col
+    )["gaps"]
+
+
+def find_stuck_sensors(
+    df: pd.DataFrame,
+    min_run: int = 6,
+    tolerance: float = 0.0,
+    value_col: str = "valor_lectura",
+    time_col: str = "data_lectura",
+) -> pd.DataFrame:
+    """Return intervals of at least min_run consecutive identical readings."""
+    return detect_data_issues(
+        df, expected_cadence=None, stuck_min_run=min_run, stuck_tolerance=tolerance,
+        value_col=value_col, time_col=time_col,
+    )["stuck"]
+
+
+def find_out_of_range_values(
+    df: pd.DataFrame,
+    limits: LimitsSpec,
+    value_col: str = "valor_lectura",
+    time_col: str = "data_lectura",
+) -> pd.DataFrame:
+    """Return intervals of consecutive readings outside the (min, max) limits of their variable."""
+    return detect_data_issues(
+        df, expected_cadence=None, limits=limits, value_col=value_col, time_col=time_col
+    )["out_of_range"]
+
+
+def find_spikes(
+    df: pd.DataFrame,
+    threshold: ThresholdSpec,
+    window: int = 5,
+    value_col: str = "valor_lectura",
+    time_col: str = "data_lectura",
+) -> pd.DataFrame:
+    """Return readings deviating more than threshold from their centred rolling median."""
+    return detect_data_issues(
+        df, expected_cadence=None, spike_threshold=threshold, spike_window=window,
+        value_col=value_col, time_col=time_col,
+    )["spikes"]
+
+
+def gaps_to_soql_filters(
+    gaps: pd.DataFrame,
+) -> List[Dict[str, xptdd.Condition]]:
+    """
+    Convert a gaps table into filter dictionaries for fetch_socrata_csv_with_filters(),
+    one per gap, to re-fetch only the missing readings.
+    """
+    fmt = xptdd.DATETIME_FILTER_FORMAT
+    starts = pd.to_datetime(gaps["start"], utc=True).dt.strftime(fmt)
+    ends = pd.to_datetime(gaps["end"], utc=True).dt.strftime(fmt)
+    return [
+        {
+            "codi_estacio": station,
+            "codi_variable": variable,
+            "data_lectura": [(">=", s), ("<=", e)],
+        }
+        for station, variable, s, e in zip(gaps["codi_estacio"], gaps["codi_variable"], starts, ends)
+    ]
@@ -1,16 +1,19 @@
+from __future__ import annotations
+
 from pathlib import Path
 import logging
-from typing import Union
-import pandas as pd
-import numpy as np
-import math
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple, Union
 
 import xemapytools._utils as _utils
-import xemapytools.data_download as xptdd
-import xemapytools.data_treatment as xptdt
 import xemapytools.resources.XEMA_standards as XEMA_standards
 import xemapytools.resources.url_list as url_list
 
+# Heavy dependencies are imported inside the functions that use them,
+# so importing this module stays fast
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +27,9 @@ def download_and_backup_XEMA_reference_dataframes(
 
     Returns a mapping of descriptive names to saved file paths.
     """
+    import xemapytools.data_download as xptdd
+    import xemapytools.data_treatment as xptdt
+
     base = Path(base_dir)
     base.mkdir(parents=True, exist_ok=True)
     logger.info(f"Ensured base directory exists: {base.resolve()}")
@@ -90,6 +96,9 @@ def get_stations_by_radius(
                       the distance from the central point. If no stations are found,
                       an empty DataFrame is returned.
     """
+    import pandas as pd
+    import xemapytools.data_treatment as xptdt
+
     try:
         # Check if the data source is a DataFrame or a file path
         if isinstance(data_source, pd.DataFrame):
@@ -107,10 +116,11 @@ def get_stations_by_radius(
             logger.warning("No station data found. Returning empty DataFrame.")
             return df_stations
             
-        df_stations['dist_km'] = df_stations.apply(
+        # assign() returns a new DataFrame, so the caller's data is left untouched
+        df_stations = df_stations.assign(dist_km=df_stations.apply(
             lambda row: _utils.haversine_km(lat, lon, row['latitud'], row['longitud']),
             axis=1
-        )
+        ))
         df_filtered = df_stations[df_stations['dist_km'] <= radius_km].copy()
         
         # 3. Sort the stations by distance
@@ -123,24 +133,72 @@ def get_stations_by_radius(
         logger.error(f"An error occurred while getting the stations: {e}")
         return pd.DataFrame()
 
+def get_geographic_circles(
+    center_lats: Union[float, Sequence[float], np.ndarray],
+    center_lons: Union[float, Sequence[float], np.ndarray],
+    radii_km: Union[float, Sequence[float], np.ndarray],
+    n_points: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized computation of geographic circles for many centres and radii at once.
+    Centres and radii are broadcast against each other.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Latitudes and longitudes of the circle points,
+                                       each with shape (n_circles, n_points).
+    """
+    import numpy as np
+
+    lat_rad = np.radians(np.atleast_1d(np.asarray(center_lats, dtype=float)))
+    lon_rad = np.radians(np.atleast_1d(np.asarray(center_lons, dtype=float)))
+    d = np.atleast_1d(np.asarray(radii_km, dtype=float)) / _utils.R_EARTH_KM
+    lat_rad, lon_rad, d = (a[:, None] for a in np.broadcast_arrays(lat_rad, lon_rad, d))
+
+    angles = np.linspace(0, 2*np.pi, n_points)[None, :]
+    sin_lat, cos_lat = np.sin(lat_rad), np.cos(lat_rad)
+    sin_d, cos_d = np.sin(d), np.cos(d)
+
+    lat_p = np.arcsin(sin_lat*cos_d + cos_lat*sin_d*np.cos(angles))
+    lon_p = lon_rad + np.arctan2(
+        np.sin(angles)*sin_d*cos_lat,
+        cos_d - sin_lat*np.sin(lat_p)
+    )
+    return np.degrees(lat_p), np.degrees(lon_p)
+
+def get_geographic_circles_geojson(
+    center_lats: Union[float, Sequence[float], np.ndarray],
+    center_lons: Union[float, Sequence[float], np.ndarray],
+    radii_km: Union[float, Sequence[float], np.ndarray],
+    n_points: int = 100,
+    properties: Optional[Sequence[dict]] = None,
+) -> dict:
+    """
+    Returns a GeoJSON FeatureCollection with one closed Polygon per circle,
+    built from get_geographic_circles(). `properties`, if given, must contain
+    one dict per circle.
+    """
+    import numpy as np
+
+    lats, lons = get_geographic_circles(center_lats, center_lons, radii_km, n_points)
+    rings = np.stack([lons, lats], axis=-1)
+    rings[:, -1] = rings[:, 0]  # GeoJSON rings must be explicitly closed
+
+    if properties is not None and len(properties) != len(rings):
+        raise ValueError("properties must contain one entry per circle.")
+
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+            "properties": properties[i] if properties is not None else {},
+        }
+        for i, ring in enumerate(rings.tolist())
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
 def get_geographic_circle(center_lat, center_lon, radius_km, n_points=100):
     """
     Returns the latitudes and longitudes that form a geographic circle of radius_km.
     """
-    angles = np.linspace(0, 2*np.pi, n_points)
-    lats, lons = [], []
-    d = radius_km / _utils.R_EARTH_KM
-    lat_rad = math.radians(center_lat)
-    lon_rad = math.radians(center_lon)
-
-    for angle in angles:
-        lat_p = math.asin(
-            math.sin(lat_rad)*math.cos(d) + math.cos(lat_rad)*math.sin(d)*math.cos(angle)
-        )
-        lon_p = lon_rad + math.atan2(
-            math.sin(angle)*math.sin(d)*math.cos(lat_rad),
-            math.cos(d) - math.sin(lat_rad)*math.sin(lat_p)
-        )
-        lats.append(math.degrees(lat_p))
-        lons.append(math.degrees(lon_p))
-    return lats, lons
+    lats, lons = get_geographic_circles(center_lat, center_lon, radius_km, n_points)
+    return lats[0].tolist(), lons[0].tolist()
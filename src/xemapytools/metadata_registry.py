@@ -0,0 +1,178 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import xemapytools.data_treatment as xptdt
+import xemapytools.resources.XEMA_standards as XEMA_standards
+
+logger = logging.getLogger(__name__)
+
+# File names used by main_functions.download_and_backup_XEMA_reference_dataframes()
+STATIONS_FILENAME = "stations_raw_metadata.csv"
+VARIABLES_FILENAME = "variables_raw_metadata.csv"
+
+DEFAULT_STATION_COLUMNS = ("nom_estacio", "latitud", "longitud", "altitud")
+DEFAULT_VARIABLE_COLUMNS = ("nom_variable", "unitat", "decimals")
+
+MetadataSource = Union[Path, str, Mapping[str, Union[Path, str]]]
+FileSignature = Tuple[int, int]
+
+_registries: Dict[Tuple[Path, Path], "MetadataRegistry"] = {}
+_registries_lock = threading.Lock()
+
+
+def _resolve_paths(source: MetadataSource) -> Tuple[Path, Path]:
+    """Accept a base directory or the mapping returned by download_and_backup_XEMA_reference_dataframes()."""
+    if isinstance(source, Mapping):
+        return Path(source["stations_raw"]).resolve(), Path(source["variables_raw"]).resolve()
+    base = Path(source)
+    return (base / STATIONS_FILENAME).resolve(), (base / VARIABLES_FILENAME).resolve()
+
+
+def _file_signature(path: Path) -> FileSignature:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        logger.error(f"CSV file not found: {path}")
+        raise
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _lookup_codes(values: pd.Series, index: pd.Index) -> np.ndarray:
+    """
+    Positions of `values` in a unique `index` (-1 where missing).
+    Only the distinct values (categories) are hashed; rows are resolved by their
+    categorical codes.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        cat = values.cat.rename_categories(values.cat.categories.astype(str))
+    else:
+        cat = values.astype(str).astype("category")
+    category_positions = np.append(index.get_indexer(cat.cat.categories), -1)
+    # NaN rows have code -1, which picks the trailing -1 sentinel
+    return category_positions[cat.cat.codes.to_numpy()]
+
+
+class MetadataRegistry:
+    """
+    Stations and variables reference data, loaded once and indexed by
+    codi_estacio / codi_variable. The files are reloaded automatically when
+    they change on disk.
+    """
+
+    def __init__(self, stations_path: Path, variables_path: Path):
+        self.stations_path = Path(stations_path)
+        self.variables_path = Path(variables_path)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[FileSignature, FileSignature]] = None
+        self._stations = pd.DataFrame()
+        self._variables = pd.DataFrame()
+        self._refresh()
+
+    def _refresh(self) -> None:
+        signature = (_file_signature(self.stations_path), _file_signature(self.variables_path))
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            stations = xptdt.standardize_dataframe(
+                xptdt.load_local_csv_as_dataframe(self.stations_path, dtype={"codi_estacio": str}),
+                XEMA_standards.STATIONS_STANDARD_DTYPES_MAPPING,
+            )
+            variables = xptdt.standardize_dataframe(
+                xptdt.load_local_csv_as_dataframe(self.variables_path, dtype={"codi_variable": str}),
+                XEMA_standards.VARIABLES_STANDARD_DTYPES_MAPPING,
+            )
+            self._stations = stations.drop_duplicates("codi_estacio", keep="last").set_index("codi_estacio")
+            self._variables = variables.drop_duplicates("codi_variable", keep="last").set_index("codi_variable")
+            self._signature = signature
+            logger.info(
+                f"Loaded metadata registry with {len(self._stations)} stations "
+                f"and {len(self._variables)} variables."
+            )
+
+    def _tables(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Current cached (stations, variables) frames. Must not be modified."""
+        self._refresh()
+        with self._lock:
+            return self._stations, self._variables
+
+    @property
+    def stations(self) -> pd.DataFrame:
+        """Copy of the standardized stations metadata indexed by codi_estacio."""
+        return self._tables()[0].copy()
+
+    @property
+    def variables(self) -> pd.DataFrame:
+        """Copy of the standardized variables metadata indexed by codi_variable."""
+        return self._tables()[1].copy()
+
+    def station(self, codi_estacio: str) -> pd.Series:
+        """Metadata of one station. Raises KeyError if it is unknown."""
+        return self._tables()[0].loc[str(codi_estacio)].copy()
+
+    def variable(self, codi_variable: Union[str, int]) -> pd.Series:
+        """Metadata of one variable. Raises KeyError if it is unknown."""
+        return self._tables()[1].loc[str(codi_variable)].copy()
+
+    def station_attribute(self, column: str) -> pd.Series:
+        """codi_estacio -> column mapping, usable with Series.map()."""
+        return self._tables()[0][column].copy()
+
+    def variable_attribute(self, column: str) -> pd.Series:
+        """codi_variable -> column mapping, usable with Series.map()."""
+        return self._tables()[1][column].copy()
+
+    def enrich_readings(
+        self,
+        df: pd.DataFrame,
+        station_columns: Sequence[str] = DEFAULT_STATION_COLUMNS,
+        variable_columns: Sequence[str] = DEFAULT_VARIABLE_COLUMNS,
+    ) -> pd.DataFrame:
+        """
+        Return a copy of a readings DataFrame with station and variable metadata
+        columns added. Unknown codes get missing values. Columns already present
+        in `df` are overwritten.
+        """
+        df = df.copy()
+        stations, variables = self._tables()
+        for key, table, columns in (
+            ("codi_estacio", stations, station_columns),
+            ("codi_variable", variables, variable_columns),
+        ):
+            if not columns or key not in df.columns:
+                continue
+            codes = _lookup_codes(df[key], table.index)
+            missing = int((codes == -1).sum())
+            if missing:
+                logger.warning(f"{missing} rows have a {key} not found in the metadata registry.")
+            for col in columns:
+                df[col] = pd.api.extensions.take(table[col].array, codes, allow_fill=True)
+        return df
+
+
+def get_metadata_registry(source: MetadataSource) -> MetadataRegistry:
+    """
+    Return the process-wide registry for the reference CSVs saved by
+    download_and_backup_XEMA_reference_dataframes(). `source` is the base
+    directory or the returned mapping of paths. Registries are cached per
+    pair of files and reload them when they change.
+    """
+    key = _resolve_paths(source)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = MetadataRegistry(*key)
+            _registries[key] = registry
+    return registry
+
+
+def clear_metadata_registries() -> None:
+    """Drop all cached registries, forcing the next access to reload from disk."""
+    with _registries_lock:
+        _registries.clear()
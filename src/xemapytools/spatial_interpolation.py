@@ -0,0 +1,261 @@
+import logging
+from typing import Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import xemapytools._utils as _utils
+
+logger = logging.getLogger(__name__)
+
+InterpolationMethod = Literal["idw", "nearest"]
+
+# Distances below this threshold (km) are treated as a target sitting on a station
+_COINCIDENT_DISTANCE_KM = 1e-6
+
+
+def _prepare_station_matrix(
+    readings: pd.DataFrame,
+    stations: pd.DataFrame,
+    value_col: str,
+    time_col: str,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Pivot readings to a (time x station) matrix and align the station metadata
+    to its columns. Stations without coordinates are dropped.
+    """
+    if "codi_variable" in readings.columns and readings["codi_variable"].nunique() > 1:
+        raise ValueError(
+            "Readings contain more than one codi_variable; filter a single variable before interpolating."
+        )
+
+    stations = stations.dropna(subset=["latitud", "longitud"]).drop_duplicates("codi_estacio")
+    stations = stations.set_index(stations["codi_estacio"].astype(str))
+
+    values = readings.pivot_table(
+        index=time_col,
+        columns=readings["codi_estacio"].astype(str),
+        values=value_col,
+        aggfunc="mean",
+    )
+    missing = values.columns.difference(stations.index)
+    if len(missing) > 0:
+        logger.warning(f"Dropping {len(missing)} stations without coordinates: {list(missing)}")
+        values = values.drop(columns=missing)
+
+    return values, stations.loc[values.columns]
+
+
+def _weighted_mean(
+    filled: np.ndarray,
+    valid: np.ndarray,
+    weights: np.ndarray,
+) -> np.ndarray:
+    """
+    Apply a (targets x stations) weight matrix to a (time x station) value matrix,
+    renormalizing per timestamp so missing readings are ignored.
+    """
+    numerator = filled @ weights.T
+    denominator = valid.astype(float) @ weights.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = numerator / denominator
+    result[denominator == 0] = np.nan
+    return result
+
+
+def _nearest_k_mean(
+    filled: np.ndarray,
+    valid: np.ndarray,
+    dist: np.ndarray,
+    method: InterpolationMethod,
+    power: float,
+    k: int,
+) -> np.ndarray:
+    """
+    Weighted mean of the k nearest stations that have a reading at each timestamp.
+    Stations are visited in order of distance once per target, accumulating the
+    first k valid readings of every (timestamp, target) pair.
+    """
+    n_times, n_targets = filled.shape[0], dist.shape[0]
+    order = np.argsort(dist, axis=1)
+    rows = np.arange(n_targets)
+    needed = np.minimum(k, valid.sum(axis=1))[:, None]
+
+    numerator = np.zeros((n_times, n_targets))
+    denominator = np.zeros((n_times, n_targets))
+    count = np.zeros((n_times, n_targets), dtype=np.int64)
+    for rank in range(dist.shape[1]):
+        if (count >= needed).all():
+            break
+        idx = order[:, rank]
+        selected = valid[:, idx] & (count < k)
+        if method == "nearest":
+            w = np.ones(n_targets)
+        else:
+            # Coincident stations are handled by the caller
+            d = dist[rows, idx]
+            w = np.where(d < _COINCIDENT_DISTANCE_KM, 0.0, 1.0 / np.maximum(d, _COINCIDENT_DISTANCE_KM) ** power)
+        numerator += np.where(selected, filled[:, idx] * w, 0.0)
+        denominator += selected * w
+        count += selected
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = numerator / denominator
+    result[denominator == 0] = np.nan
+    return result
+
+
+def _interpolate_matrix(
+    values: np.ndarray,
+    dist: np.ndarray,
+    method: InterpolationMethod,
+    power: float,
+    k: Optional[int],
+) -> np.ndarray:
+    """
+    Interpolate a (time x station) value matrix onto the targets of a
+    (targets x stations) distance matrix in km. Stations are chosen per timestamp
+    among those with a reading, so a missing reading never hides the others.
+    """
+    if method not in ("idw", "nearest"):
+        raise ValueError(f"Unknown interpolation method: {method!r}")
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    coincident = dist < _COINCIDENT_DISTANCE_KM
+
+    if k is not None and k < dist.shape[1]:
+        result = _nearest_k_mean(filled, valid, dist, method, power, k)
+    elif method == "nearest":
+        result = _weighted_mean(filled, valid, np.ones_like(dist))
+    else:
+        with np.errstate(divide="ignore"):
+            weights = np.where(coincident, 0.0, 1.0 / dist**power)
+        result = _weighted_mean(filled, valid, weights)
+
+    if method == "idw" and coincident.any():
+        # Targets lying on a station take that station's value when it reported
+        on_station = _weighted_mean(filled, valid, coincident.astype(float))
+        result = np.where(np.isnan(on_station), result, on_station)
+
+    return result
+
+
+def interpolate_to_points(
+    readings: pd.DataFrame,
+    stations: pd.DataFrame,
+    targets: pd.DataFrame,
+    method: InterpolationMethod = "idw",
+    power: float = 2.0,
+    k: Optional[int] = None,
+    lapse_rate_per_km: Optional[float] = None,
+    value_col: str = "valor_lectura",
+    time_col: str = "data_lectura",
+    batch_size: int = 2048,
+) -> pd.DataFrame:
+    """
+    Interpolate the readings of a single variable onto arbitrary target points.
+
+    Args:
+        readings (pd.DataFrame): Standardized readings with `codi_estacio`, `time_col`
+                                 and `value_col` columns.
+        stations (pd.DataFrame): Standardized station metadata with `codi_estacio`,
+                                 `latitud`, `longitud` (and `altitud` if a lapse rate is used).
+        targets (pd.DataFrame): Points to interpolate to, with `latitud`, `longitud`
+                                (and `altitud` if a lapse rate is used).
+        method (str): "idw" for inverse-distance weighting or "nearest" for the
+                      unweighted mean of the k nearest stations.
+        power (float): IDW distance exponent.
+        k (Optional[int]): Number of nearest stations to use. None uses all stations
+                           for "idw" and 1 for "nearest".
+        lapse_rate_per_km (Optional[float]): If given, values are reduced to sea level
+                                             with this rate (e.g. -6.5 for temperature)
+                                             and restored at the target altitude.
+        batch_size (int): Number of targets processed per matrix operation.
+
+    Returns:
+        pd.DataFrame: Interpolated values indexed by `time_col`, one column per
+                      target (labelled with the `targets` index). Timestamps where
+                      no contributing station has data are NaN.
+    """
+    if method == "nearest" and k is None:
+        k = 1
+    if k is not None and k < 1:
+        raise ValueError("k must be a positive integer.")
+    if lapse_rate_per_km is not None:
+        for name, frame in (("stations", stations), ("targets", targets)):
+            if "altitud" not in frame.columns:
+                raise ValueError(f"lapse_rate_per_km requires an 'altitud' column in {name}.")
+
+    values, stations = _prepare_station_matrix(readings, stations, value_col, time_col)
+    if values.empty:
+        logger.warning("No readings to interpolate. Returning empty DataFrame.")
+        return pd.DataFrame(index=values.index, columns=targets.index, dtype=float)
+
+    value_matrix = values.to_numpy(dtype=float)
+    if lapse_rate_per_km is not None:
+        no_altitude = stations.index[stations["altitud"].isna()]
+        if len(no_altitude) > 0:
+            logger.warning(f"Ignoring {len(no_altitude)} stations without altitude: {list(no_altitude)}")
+        station_alt_km = stations["altitud"].to_numpy(dtype=float) / 1000.0
+        value_matrix = value_matrix - lapse_rate_per_km * station_alt_km[None, :]
+
+    src_lat = stations["latitud"].to_numpy(dtype=float)
+    src_lon = stations["longitud"].to_numpy(dtype=float)
+    tgt_lat = targets["latitud"].to_numpy(dtype=float)
+    tgt_lon = targets["longitud"].to_numpy(dtype=float)
+
+    result = np.empty((value_matrix.shape[0], len(targets)), dtype=float)
+    for start in range(0, len(targets), batch_size):
+        stop = start + batch_size
+        dist = _utils.haversine_km_matrix(tgt_lat[start:stop], tgt_lon[start:stop], src_lat, src_lon)
+        result[:, start:stop] = _interpolate_matrix(value_matrix, dist, method, power, k)
+
+    if lapse_rate_per_km is not None:
+        target_alt_km = targets["altitud"].to_numpy(dtype=float) / 1000.0
+        result += lapse_rate_per_km * target_alt_km[None, :]
+
+    logger.info(
+        f"Interpolated {value_matrix.shape[0]} timestamps from {value_matrix.shape[1]} "
+        f"stations onto {len(targets)} points."
+    )
+    return pd.DataFrame(result, index=values.index, columns=targets.index)
+
+
+def interpolate_to_grid(
+    readings: pd.DataFrame,
+    stations: pd.DataFrame,
+    lat_min: float,
+    lat_max: float,
+    lon_min: float,
+    lon_max: float,
+    n_lat: int = 100,
+    n_lon: int = 100,
+    grid_altitudes: Optional[np.ndarray] = None,
+    **interpolation_kwargs,
+) -> Tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Interpolate the readings of a single variable onto a regular lat/lon grid.
+    Extra keyword arguments are passed to interpolate_to_points().
+
+    Returns:
+        Tuple: (timestamps, grid latitudes, grid longitudes, values) where values
+               has shape (n_times, n_lat, n_lon).
+    """
+    if interpolation_kwargs.get("lapse_rate_per_km") is not None and grid_altitudes is None:
+        raise ValueError("lapse_rate_per_km requires grid_altitudes.")
+
+    lats = np.linspace(lat_min, lat_max, n_lat)
+    lons = np.linspace(lon_min, lon_max, n_lon)
+    grid_lat, grid_lon = np.meshgrid(lats, lons, indexing="ij")
+
+    targets = pd.DataFrame({"latitud": grid_lat.ravel(), "longitud": grid_lon.ravel()})
+    if grid_altitudes is not None:
+        grid_altitudes = np.asarray(grid_altitudes, dtype=float)
+        if grid_altitudes.shape != (n_lat, n_lon):
+            raise ValueError(f"grid_altitudes must have shape ({n_lat}, {n_lon}).")
+        targets["altitud"] = grid_altitudes.ravel()
+
+    result = interpolate_to_points(readings, stations, targets, **interpolation_kwargs)
+    values = result.to_numpy().reshape(len(result.index), n_lat, n_lon)
+    return result.index, lats, lons, values
@@ -0,0 +1,216 @@
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Archive layout: two flat binary files holding every series back to back,
+# plus a small CSV index with the position of each (station, variable) series.
+# Each write goes to a new `data-<id>` directory and is published by atomically
+# replacing the CURRENT pointer, so open readers keep their consistent mappings.
+_CURRENT_FILENAME = "CURRENT"
+_DATA_DIR_PREFIX = "data-"
+_OPEN_ATTEMPTS = 5
+_TIMESTAMPS_FILENAME = "timestamps.bin"
+_VALUES_FILENAME = "values.bin"
+_INDEX_FILENAME = "index.csv"
+_TIMESTAMP_DTYPE = np.dtype("<i8")  # nanoseconds since epoch, UTC
+_VALUE_DTYPE = np.dtype("<f8")
+
+SeriesKey = Tuple[str, str]
+TimeBound = Optional[Union[str, pd.Timestamp, np.datetime64]]
+
+
+def _to_utc_nanoseconds(values: pd.Series) -> np.ndarray:
+    """Convert a datetime-like Series to int64 nanoseconds since epoch (UTC)."""
+    dt = pd.to_datetime(values, utc=True, errors="coerce")
+    return dt.dt.tz_convert(None).to_numpy(dtype="datetime64[ns]").view("int64")
+
+
+def _bound_to_nanoseconds(bound: TimeBound) -> Optional[int]:
+    if bound is None:
+        return None
+    ts = pd.Timestamp(bound)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.tz_convert("UTC").as_unit("ns").value
+
+
+def _read_current(path: Path) -> Optional[str]:
+    """Name of the published data directory of an archive, or None if there is none."""
+    try:
+        name = (path / _CURRENT_FILENAME).read_text().strip()
+    except FileNotFoundError:
+        return None
+    if not name.startswith(_DATA_DIR_PREFIX) or os.sep in name:
+        raise ValueError(f"Invalid archive pointer in {path / _CURRENT_FILENAME}: {name!r}")
+    return name
+
+
+def write_timeseries_archive(
+    df: pd.DataFrame,
+    archive_dir: Union[Path, str],
+    value_col: str = "valor_lectura",
+    time_col: str = "data_lectura",
+    overwrite: bool = True,
+) -> Path:
+    """
+    Write standardized readings to a memory-mappable archive directory.
+    Each (codi_estacio, codi_variable) series is stored sorted by time.
+    Overwrites by default unless overwrite=False. An existing archive is
+    replaced atomically: readers that already opened it keep seeing the old data.
+    """
+    path = Path(archive_dir)
+    current_path = path / _CURRENT_FILENAME
+    previous = _read_current(path)
+    if previous is not None and not overwrite:
+        raise FileExistsError(f"{path} already contains an archive and overwrite=False.")
+    path.mkdir(parents=True, exist_ok=True)
+
+    data = pd.DataFrame({
+        "codi_estacio": df["codi_estacio"].astype(str).to_numpy(),
+        "codi_variable": df["codi_variable"].astype(str).to_numpy(),
+        "t": _to_utc_nanoseconds(df[time_col]),
+        "v": pd.to_numeric(df[value_col], errors="coerce").to_numpy(dtype=float),
+    })
+    nat = data["t"] == np.iinfo(np.int64).min
+    if nat.any():
+        logger.warning(f"Dropping {int(nat.sum())} rows with invalid timestamps.")
+        data = data[~nat]
+    data = data.sort_values(["codi_estacio", "codi_variable", "t"], kind="stable", ignore_index=True)
+
+    groups = data.groupby(["codi_estacio", "codi_variable"], sort=False)
+    index = groups["t"].agg(length="size", start="min", end="max").reset_index()
+    lengths = index["length"].to_numpy(dtype=np.int64)
+    index.insert(2, "offset", np.cumsum(lengths) - lengths)
+    index["start"] = pd.to_datetime(index["start"], utc=True)
+    index["end"] = pd.to_datetime(index["end"], utc=True)
+
+    data_name = f"{_DATA_DIR_PREFIX}{uuid.uuid4().hex}"
+    data_dir = path / data_name
+    tmp_current = path / f".{_CURRENT_FILENAME}.tmp-{os.getpid()}"
+    data_dir.mkdir()
+    try:
+        data["t"].to_numpy(dtype=_TIMESTAMP_DTYPE).tofile(data_dir / _TIMESTAMPS_FILENAME)
+        data["v"].to_numpy(dtype=_VALUE_DTYPE).tofile(data_dir / _VALUES_FILENAME)
+        index.to_csv(data_dir / _INDEX_FILENAME, index=False)
+        # Publish the new data directory. Files of a published directory are never modified
+        tmp_current.write_text(data_name)
+        os.replace(tmp_current, current_path)
+    except BaseException:
+        shutil.rmtree(data_dir, ignore_errors=True)
+        tmp_current.unlink(missing_ok=True)
+        raise
+
+    # Processes that already mapped the old files keep reading them until they close
+    if previous is not None and previous != data_name:
+        shutil.rmtree(path / previous, ignore_errors=True)
+
+    logger.info(f"Wrote archive with {len(data)} readings in {len(index)} series to {path}")
+    return path
+
+
+class TimeSeriesArchive:
+    """
+    Read-only view of an archive written by write_timeseries_archive().
+    Data files are opened with np.memmap, so reads are zero-copy slices and
+    the archive can be shared by several processes.
+    """
+
+    def __init__(self, archive_dir: Union[Path, str]):
+        self.path = Path(archive_dir)
+        for attempt in range(_OPEN_ATTEMPTS):
+            data_name = _read_current(self.path)
+            if data_name is None:
+                logger.error(f"Archive not found: {self.path}")
+                raise FileNotFoundError(f"Archive not found: {self.path}")
+            try:
+                self._load(self.path / data_name)
+                break
+            except FileNotFoundError:
+                # A writer replaced the archive between reading CURRENT and the data files
+                if attempt == _OPEN_ATTEMPTS - 1:
+                    raise
+        logger.info(f"Opened archive {self.path} with {len(self.index)} series.")
+
+    def _load(self, data_dir: Path) -> None:
+        # Map the data files before reading the index so a concurrent writer
+        # cannot remove them in between
+        self._timestamps = self._open(data_dir / _TIMESTAMPS_FILENAME, _TIMESTAMP_DTYPE)
+        self._values = self._open(data_dir / _VALUES_FILENAME, _VALUE_DTYPE)
+        self.index = pd.read_csv(
+            data_dir / _INDEX_FILENAME,
+            dtype={"codi_estacio": str, "codi_variable": str, "offset": np.int64, "length": np.int64},
+            parse_dates=["start", "end"],
+        )
+        self._positions: Dict[SeriesKey, Tuple[int, int]] = {
+            (st, var): (off, off + n)
+            for st, var, off, n in zip(
+                self.index["codi_estacio"], self.index["codi_variable"],
+                self.index["offset"], self.index["length"],
+            )
+        }
+
+    @staticmethod
+    def _open(file_path: Path, dtype: np.dtype) -> np.ndarray:
+        if file_path.stat().st_size == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(file_path, dtype=dtype, mode="r")
+
+    def __contains__(self, key: SeriesKey) -> bool:
+        return (str(key[0]), str(key[1])) in self._positions
+
+    def read(
+        self,
+        codi_estacio: str,
+        codi_variable: Union[str, int],
+        start: TimeBound = None,
+        end: TimeBound = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the (timestamps, values) of one series between start and end
+        (both inclusive, naive bounds are taken as UTC). Timestamps are
+        datetime64[ns] in UTC. Both arrays are read-only views into the archive.
+        """
+        key = (str(codi_estacio), str(codi_variable))
+        if key not in self._positions:
+            raise KeyError(f"Series not found in archive: {key}")
+        lo, hi = self._positions[key]
+
+        times = self._timestamps[lo:hi]
+        start_ns = _bound_to_nanoseconds(start)
+        end_ns = _bound_to_nanoseconds(end)
+        i = 0 if start_ns is None else int(np.searchsorted(times, start_ns, side="left"))
+        j = len(times) if end_ns is None else int(np.searchsorted(times, end_ns, side="right"))
+
+        return times[i:j].view("datetime64[ns]"), self._values[lo + i:lo + j]
+
+    def read_dataframe(
+        self,
+        codi_estacio: str,
+        codi_variable: Union[str, int],
+        start: TimeBound = None,
+        end: TimeBound = None,
+    ) -> pd.DataFrame:
+        """
+        Same as read(), but returns a standardized readings DataFrame
+        (this copies the selected window into memory).
+        """
+        times, values = self.read(codi_estacio, codi_variable, start, end)
+        return pd.DataFrame({
+            "codi_estacio": str(codi_estacio),
+            "codi_variable": str(codi_variable),
+            "data_lectura": pd.to_datetime(np.asarray(times), utc=True),
+            "valor_lectura": np.asarray(values),
+        })
+
+
+def open_timeseries_archive(archive_dir: Union[Path, str]) -> TimeSeriesArchive:
+    """Open an archive written by write_timeseries_archive() in read-only mode."""
+    return TimeSeriesArchive(archive_dir)
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import xemapytools.batch_conversion as xptbc
+import xemapytools.data_treatment as xptdt
+from xemapytools.resources import XEMA_standards
+
+DTYPES = XEMA_standards.WEATHER_DATA_STANDARD_DTYPES_MAPPING
+COLTOAPI = XEMA_standards.WEATHER_DATA_STANDARD_COLTOAPI_MAPPING
+SORT = ["id"]
+
+
+def _write_raw_csv(path, n_rows, seed=0, prefix="r"):
+    """Raw CSV with API column names, as downloaded from the portal."""
+    rng = np.random.default_rng(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        "ID": [f"{prefix}{i}" for i in range(n_rows)],
+        "CODI_ESTACIO": rng.choice(["V4", "YH", "D5"], n_rows),
+        "CODI_VARIABLE": rng.choice(["32", "33"], n_rows),
+        "DATA_LECTURA": pd.date_range("2024-01-01", periods=n_rows, freq="30min").strftime("%Y-%m-%dT%H:%M:%S.000"),
+        "VALOR_LECTURA": rng.normal(10, 3, n_rows).round(1),
+    }).to_csv(path, index=False)
+    return path
+
+
+def _convert(inputs, out, **kwargs):
+    kwargs.setdefault("max_workers", 1)
+    return xptbc.convert_csv_files_partitioned(inputs, out, DTYPES, COLTOAPI, **kwargs)
+
+
+def _load(out, **filters):
+    df = xptbc.load_partitioned_csv_as_dataframe(out, DTYPES, **filters)
+    return df.sort_values(SORT, ignore_index=True)
+
+
+def _expected(*paths):
+    raw = pd.concat([pd.read_csv(p, dtype=str) for p in paths], ignore_index=True)
+    return xptdt.standardize_dataframe(raw, DTYPES, COLTOAPI).sort_values(SORT, ignore_index=True)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_partitioned_round_trip(tmp_path, max_workers):
+    raw = _write_raw_csv(tmp_path / "raw.csv", 500)
+    out = tmp_path / "out"
+
+    written = _convert(raw, out, partition_by=["codi_estacio", "codi_variable"], chunksize=120, max_workers=max_workers)
+
+    assert all(p.exists() and p.is_relative_to(out) for p in written)
+    assert {p.parent.parent.name for p in written} == {"codi_estacio=V4", "codi_estacio=YH", "codi_estacio=D5"}
+    result = _load(out)
+    pd.testing.assert_frame_equal(result[_expected(raw).columns], _expected(raw))
+
+    selected = _load(out, codi_estacio=["V4", "YH"], codi_variable="32")
+    assert set(selected["codi_estacio"]) == {"V4", "YH"} and set(selected["codi_variable"]) == {"32"}
+    assert len(selected) == ((result["codi_estacio"] != "D5") & (result["codi_variable"] == "32")).sum()
+
+
+def test_inputs_sharing_a_file_name_keep_unique_part_names(tmp_path):
+    first = _write_raw_csv(tmp_path / "a" / "w.csv", 100, seed=1, prefix="a")
+    second = _write_raw_csv(tmp_path / "b" / "w.csv", 100, seed=2, prefix="b")
+
+    written = _convert([first, second], tmp_path / "out", chunksize=40)
+
+    assert len(written) == len(set(written))
+    assert {p.name.split("-")[0] for p in written} == {"0000", "0001"}
+    result = _load(tmp_path / "out")
+    pd.testing.assert_frame_equal(result[_expected(first, second).columns], _expected(first, second))
+
+
+def test_overwrite_replaces_previous_output(tmp_path):
+    raw = _write_raw_csv(tmp_path / "raw.csv", 300)
+    out = tmp_path / "out"
+    _convert(raw, out, partition_by=["codi_estacio", "codi_variable"], chunksize=50)
+
+    # A different layout and chunk size must not leave stale part files behind
+    written = _convert(raw, out, chunksize=1000)
+
+    assert sorted(out.rglob("*.csv")) == sorted(written)
+    assert len(_load(out)) == 300
+
+    with pytest.raises(FileExistsError, match="overwrite=False"):
+        _convert(raw, out, overwrite=False)
+
+
+def test_refuses_to_overwrite_foreign_directory(tmp_path):
+    raw = _write_raw_csv(tmp_path / "raw.csv", 50)
+    out = tmp_path / "store"
+    out.mkdir()
+    (out / "important.txt").write_text("keep me")
+
+    with pytest.raises(FileExistsError, match="not written by"):
+        _convert(raw, out)
+
+    assert (out / "important.txt").read_text() == "keep me"
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".")] == []
+
+
+def test_empty_output_dir_is_used_and_inputs_inside_output_are_rejected(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    raw = _write_raw_csv(tmp_path / "raw.csv", 50)
+    _convert(raw, out)
+    assert len(_load(out)) == 50
+
+    inside = _write_raw_csv(out / "raw.csv", 50)
+    with pytest.raises(ValueError, match="inside output_dir"):
+        _convert(inside, out)
+
+
+def test_failed_conversion_keeps_previous_output(tmp_path):
+    raw = _write_raw_csv(tmp_path / "raw.csv", 50)
+    out = tmp_path / "out"
+    before = sorted(_convert(raw, out))
+
+    with pytest.raises(KeyError, match="Partition columns"):
+        _convert(raw, out, partition_by=["missing_column"])
+
+    assert sorted(out.rglob("*.csv")) == before
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".")] == []
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import xemapytools.data_download as xptdd
+import xemapytools.data_quality as xptdq
+
+CADENCE = {"32": "30min", "40": "30min", "1000": "1D"}
+CHECKS = dict(
+    limits={"32": (-40, 45), "40": (-40, 45), "1000": (None, 40)},
+    stuck_min_run=5,
+    spike_threshold=8,
+    start="2023-12-31",
+    end="2024-02-15",
+)
+
+
+def _readings(seed: int = 0, periods: int = 200) -> pd.DataFrame:
+    """Synthetic readings with dropped rows, stuck runs, spikes, out-of-range values and NaNs."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for station in ["A", "B"]:
+        for variable, freq in [("32", "30min"), ("40", "30min"), ("1000", "1D")]:
+            times = pd.date_range("2024-01-01", periods=periods, freq=freq, tz="UTC")
+            values = rng.normal(10, 1, periods).round(1)
+            values[periods // 8:periods // 8 + 6] = 7.0
+            values[3 * periods // 10:3 * periods // 10 + 12] = 3.3
+            values[periods // 2] = 50.0
+            values[3 * periods // 4:3 * periods // 4 + 5] = -99.0
+            values[rng.random(periods) < 0.02] = np.nan
+            frames.append(pd.DataFrame({
+                "codi_estacio": station,
+                "codi_variable": variable,
+                "data_lectura": times,
+                "valor_lectura": values,
+            })[rng.random(periods) > 0.05])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _split(df: pd.DataFrame, size: int):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def _assert_same(expected, actual):
+    assert expected.keys() == actual.keys()
+    for name in expected:
+        pd.testing.assert_frame_equal(expected[name], actual[name], check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "size, periods",
+    # One row per chunk is slow, so it runs on shorter series
+    [(1, 48), (7, 200), (50, 200), (333, 200)],
+)
+@pytest.mark.parametrize("spike_window", [4, 5])
+def test_chunked_matches_whole_frame(size, periods, spike_window):
+    df = _readings(periods=periods).sort_values("data_lectura", kind="stable")
+    kwargs = dict(expected_cadence=CADENCE, spike_window=spike_window, **CHECKS)
+
+    whole = xptdq.detect_data_issues(df, **kwargs)
+    chunked = xptdq.detect_data_issues_in_chunks(_split(df, size), **kwargs)
+
+    assert all(len(table) > 0 for table in whole.values())
+    _assert_same(whole, chunked)
+
+
+def test_chunked_matches_whole_frame_with_random_chunk_sizes():
+    df = _readings(seed=1).sort_values("data_lectura", kind="stable")
+    rng = np.random.default_rng(1)
+    cuts = np.sort(rng.choice(np.arange(1, len(df)), size=30, replace=False))
+    chunks = [df.iloc[i:j] for i, j in zip(np.r_[0, cuts], np.r_[cuts, len(df)])]
+    kwargs = dict(expected_cadence=CADENCE, **CHECKS)
+
+    _assert_same(
+        xptdq.detect_data_issues(df, **kwargs),
+        xptdq.detect_data_issues_in_chunks(chunks, **kwargs),
+    )
+
+
+def test_inferred_cadence_for_variables_missing_from_first_chunk():
+    # Sorted by variable, so later variables only appear in later chunks
+    df = _readings().sort_values(["codi_variable", "codi_estacio", "data_lectura"], kind="stable")
+
+    whole = xptdq.detect_data_issues(df, expected_cadence="infer")
+    chunked = xptdq.detect_data_issues_in_chunks(_split(df, 50), expected_cadence="infer")
+
+    assert set(whole["gaps"]["codi_variable"]) == {"32", "40", "1000"}
+    _assert_same(whole, chunked)
+
+
+def test_missing_cadence_is_logged(caplog):
+    df = _readings()
+    with caplog.at_level("WARNING", logger="xemapytools.data_quality"):
+        gaps = xptdq.find_missing_timestamps(df, expected_cadence={"32": "30min"})
+    assert set(gaps["codi_variable"]) == {"32"}
+    assert "No cadence for codi_variable ['1000', '40']" in caplog.text
+
+
+def test_gaps_to_soql_filters_round_trip_through_where_clause():
+    gaps = xptdq.find_missing_timestamps(_readings(), expected_cadence=CADENCE).head(2)
+
+    filters = xptdq.gaps_to_soql_filters(gaps)
+
+    assert len(filters) == 2
+    start = gaps["start"].iloc[0].strftime("%Y-%m-%dT%H:%M:%S")
+    assert f"data_lectura >= '{start}'" in xptdd.build_soql_where_clause(filters[0])
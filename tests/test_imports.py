@@ -0,0 +1,76 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import xemapytools.main_functions as xptmf
+
+STATIONS_CSV = Path(__file__).resolve().parents[1] / "examples" / "data_store" / "stations_raw_metadata.csv"
+
+
+def _run_fresh(code: str) -> str:
+    """Run code in a new interpreter, so no heavy module is imported beforehand."""
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_light_imports_do_not_load_pandas():
+    out = _run_fresh("""
+        import sys
+        import xemapytools
+        import xemapytools.main_functions as xptmf
+        import xemapytools.data_download as xptdd
+        from xemapytools.resources import url_list
+        xptdd.build_soql_where_clause({"codi_estacio": "V4"})
+        print(sorted(m for m in ("pandas", "numpy") if m in sys.modules))
+    """)
+    assert out.strip() == "[]"
+
+
+def test_submodules_are_reachable_from_package():
+    out = _run_fresh("""
+        import xemapytools
+        print(xemapytools.data_download.build_soql_where_clause({"codi_estacio": "V4"}))
+    """)
+    assert out.strip() == "codi_estacio = 'V4'"
+
+
+def test_functions_are_thread_safe_right_after_import():
+    out = _run_fresh(f"""
+        import json
+        import threading
+        import xemapytools.main_functions as xptmf
+
+        results, errors = [], []
+
+        def work(i):
+            try:
+                if i % 2:
+                    df = xptmf.get_stations_by_radius(41.3851, 2.1734, 10, {str(STATIONS_CSV)!r})
+                    results.append(len(df))
+                else:
+                    lats, lons = xptmf.get_geographic_circles([41.0, 42.0], [2.0, 3.0], 5.0)
+                    results.append(lats.shape[0])
+            except Exception as e:
+                errors.append(repr(e))
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        import pandas
+        assert isinstance(pandas.DataFrame(), pandas.DataFrame)
+        print(json.dumps({{"errors": errors, "results": sorted(set(results))}}))
+    """)
+    report = json.loads(out)
+    assert report["errors"] == []
+    n_stations = len(xptmf.get_stations_by_radius(41.3851, 2.1734, 10, STATIONS_CSV))
+    assert n_stations > 0
+    assert report["results"] == sorted({2, n_stations})
@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pytest
+
+import xemapytools._utils as _utils
+import xemapytools.main_functions as xptmf
+
+
+def _scalar_circle(center_lat, center_lon, radius_km, n_points=100):
+    """Reference: the per-point math implementation get_geographic_circles() replaced."""
+    lats, lons = [], []
+    d = radius_km / _utils.R_EARTH_KM
+    lat_rad = math.radians(center_lat)
+    lon_rad = math.radians(center_lon)
+    for angle in np.linspace(0, 2*np.pi, n_points):
+        lat_p = math.asin(
+            math.sin(lat_rad)*math.cos(d) + math.cos(lat_rad)*math.sin(d)*math.cos(angle)
+        )
+        lon_p = lon_rad + math.atan2(
+            math.sin(angle)*math.sin(d)*math.cos(lat_rad),
+            math.cos(d) - math.sin(lat_rad)*math.sin(lat_p)
+        )
+        lats.append(math.degrees(lat_p))
+        lons.append(math.degrees(lon_p))
+    return lats, lons
+
+
+@pytest.mark.parametrize(
+    "center_lat, center_lon, radius_km, n_points",
+    [(41.39, 2.17, 10, 100), (42.7, 0.8, 0.5, 7), (-33.9, 151.2, 250, 36), (89.9, 0.0, 5, 12)],
+)
+def test_circles_match_scalar_implementation(center_lat, center_lon, radius_km, n_points):
+    expected_lats, expected_lons = _scalar_circle(center_lat, center_lon, radius_km, n_points)
+
+    lats, lons = xptmf.get_geographic_circles(center_lat, center_lon, radius_km, n_points)
+    np.testing.assert_allclose(lats[0], expected_lats, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(lons[0], expected_lons, rtol=0, atol=1e-12)
+
+    circle_lats, circle_lons = xptmf.get_geographic_circle(center_lat, center_lon, radius_km, n_points)
+    assert isinstance(circle_lats, list) and isinstance(circle_lons, list)
+    np.testing.assert_allclose(circle_lats, expected_lats, rtol=0, atol=1e-12)
+
+
+def test_circle_points_lie_at_radius():
+    lats, lons = xptmf.get_geographic_circles([41.0, 42.0], [1.0, 2.0], [5.0, 20.0], 50)
+    for lat0, lon0, radius, row_lats, row_lons in zip([41.0, 42.0], [1.0, 2.0], [5.0, 20.0], lats, lons):
+        dist = [_utils.haversine_km(lat0, lon0, lat, lon) for lat, lon in zip(row_lats, row_lons)]
+        np.testing.assert_allclose(dist, radius, rtol=1e-9)
+
+
+def test_circles_broadcast_scalars_and_arrays():
+    centers_lat = np.array([41.0, 41.5, 42.0])
+    lats, lons = xptmf.get_geographic_circles(centers_lat, 2.0, 10.0, 20)
+    assert lats.shape == lons.shape == (3, 20)
+    for i, lat in enumerate(centers_lat):
+        np.testing.assert_allclose(lats[i], _scalar_circle(lat, 2.0, 10.0, 20)[0], atol=1e-12)
+
+    lats, _ = xptmf.get_geographic_circles(41.0, 2.0, [1.0, 5.0], 20)
+    assert lats.shape == (2, 20)
+
+    with pytest.raises(ValueError):
+        xptmf.get_geographic_circles([41.0, 42.0], [1.0, 2.0, 3.0], 10.0)
+
+
+def test_geojson_rings_are_closed_polygons():
+    collection = xptmf.get_geographic_circles_geojson(
+        [41.0, 42.0], [1.0, 2.0], 10.0, n_points=16, properties=[{"codi_estacio": "A"}, {"codi_estacio": "B"}]
+    )
+
+    assert collection["type"] == "FeatureCollection"
+    assert [f["properties"] for f in collection["features"]] == [{"codi_estacio": "A"}, {"codi_estacio": "B"}]
+    lats, lons = xptmf.get_geographic_circles([41.0, 42.0], [1.0, 2.0], 10.0, 16)
+    for feature, row_lats, row_lons in zip(collection["features"], lats, lons):
+        assert feature["geometry"]["type"] == "Polygon"
+        (ring,) = feature["geometry"]["coordinates"]
+        assert len(ring) == 16
+        assert ring[0] == ring[-1]
+        # Coordinates are [lon, lat]
+        np.testing.assert_allclose(np.array(ring)[:-1], np.c_[row_lons, row_lats][:-1])
+
+
+def test_geojson_defaults_to_empty_properties_and_validates_length():
+    collection = xptmf.get_geographic_circles_geojson(41.0, 2.0, [1.0, 2.0, 3.0], n_points=8)
+    assert [f["properties"] for f in collection["features"]] == [{}, {}, {}]
+
+    with pytest.raises(ValueError, match="one entry per circle"):
+        xptmf.get_geographic_circles_geojson(41.0, 2.0, [1.0, 2.0, 3.0], properties=[{}, {}])
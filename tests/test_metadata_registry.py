@@ -0,0 +1,99 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import xemapytools.main_functions as xptmf
+import xemapytools.metadata_registry as xptmr
+
+DATA_STORE = os.path.join(os.path.dirname(__file__), "..", "examples", "data_store")
+
+
+@pytest.fixture
+def store(tmp_path):
+    for name in (xptmr.STATIONS_FILENAME, xptmr.VARIABLES_FILENAME):
+        shutil.copy(os.path.join(DATA_STORE, name), tmp_path / name)
+    xptmr.clear_metadata_registries()
+    yield tmp_path
+    xptmr.clear_metadata_registries()
+
+
+def test_lookups(store):
+    registry = xptmr.get_metadata_registry(store)
+
+    assert registry is xptmr.get_metadata_registry(str(store))
+    assert registry is xptmr.get_metadata_registry({
+        "stations_raw": store / xptmr.STATIONS_FILENAME,
+        "variables_raw": store / xptmr.VARIABLES_FILENAME,
+    })
+    assert registry.stations.index.name == "codi_estacio"
+    assert registry.station("YH")["nom_estacio"] == "Pujalt"
+    assert registry.station("YH")["altitud"] == 747.0
+    assert registry.variable(40)["nom_variable"] == "Temperatura màxima"
+    assert registry.station_attribute("nom_estacio")["UW"] == "els Alfacs"
+    assert registry.variable_attribute("unitat")["40"] == "°C"
+    with pytest.raises(KeyError):
+        registry.station("??")
+
+
+def test_returned_frames_do_not_modify_the_cache(store):
+    registry = xptmr.get_metadata_registry(store)
+
+    stations = registry.stations
+    stations["altitud"] = 0.0
+    station = registry.station("YH")
+    station["nom_estacio"] = "changed"
+    found = xptmf.get_stations_by_radius(41.7, 1.4, 30, registry.stations.reset_index())
+    direct = registry.stations
+    xptmf.get_stations_by_radius(41.7, 1.4, 30, direct)
+
+    assert len(found) > 0
+    assert "dist_km" not in direct.columns
+    assert "dist_km" not in registry.stations.columns
+    assert registry.station("YH")["altitud"] == 747.0
+    assert registry.station("YH")["nom_estacio"] == "Pujalt"
+
+
+def test_enrich_readings(store, caplog):
+    registry = xptmr.get_metadata_registry(store)
+    readings = pd.DataFrame({
+        "codi_estacio": pd.Categorical(["YH", "UW", "ZZ", "YH", None]),
+        "codi_variable": [40, 44, 40, 999, 40],
+        "valor_lectura": [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+    with caplog.at_level("WARNING", logger="xemapytools.metadata_registry"):
+        enriched = registry.enrich_readings(readings)
+
+    assert "codi_estacio" in enriched and "nom_estacio" not in readings
+    assert enriched["nom_estacio"].tolist()[:2] == ["Pujalt", "els Alfacs"]
+    assert enriched["altitud"].tolist()[:2] == [747.0, 0.0]
+    # Unknown and missing codes get NaN
+    assert enriched["nom_estacio"].iloc[[2, 4]].isna().all()
+    assert np.isnan(enriched["altitud"].iloc[2])
+    assert enriched["nom_variable"].tolist()[:3] == ["Temperatura màxima", "Humitat relativa mínima", "Temperatura màxima"]
+    assert pd.isna(enriched["unitat"].iloc[3])
+    assert "2 rows have a codi_estacio not found" in caplog.text
+    assert "1 rows have a codi_variable not found" in caplog.text
+
+    only_names = registry.enrich_readings(readings, station_columns=["nom_estacio"], variable_columns=())
+    assert list(only_names.columns) == list(readings.columns) + ["nom_estacio"]
+
+
+def test_reloads_when_the_file_changes(store):
+    registry = xptmr.get_metadata_registry(store)
+    n_stations = len(registry.stations)
+
+    path = store / xptmr.STATIONS_FILENAME
+    stations = pd.read_csv(path, dtype=str)
+    stations.loc[stations["codi_estacio"] == "YH", "nom_estacio"] = "Pujalt (nou)"
+    stations.iloc[:5].to_csv(path, index=False)
+
+    assert registry.station("YH")["nom_estacio"] == "Pujalt (nou)"
+    assert len(registry.stations) == 5 < n_stations
+
+    os.remove(path)
+    with pytest.raises(FileNotFoundError):
+        registry.stations
@@ -0,0 +1,118 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import xemapytools.spatial_interpolation as xptsi
+
+STATIONS = pd.DataFrame({
+    "codi_estacio": ["A", "B", "C"],
+    "latitud": [41.0, 41.1, 41.3],
+    "longitud": [2.0, 2.0, 2.0],
+    "altitud": [0.0, 500.0, 1000.0],
+})
+TIMES = pd.date_range("2024-01-01", periods=3, freq="30min", tz="UTC")
+
+
+def _readings(values):
+    """Readings for stations A, B, C from a (time x station) list of values."""
+    rows = [
+        {"codi_estacio": code, "data_lectura": t, "valor_lectura": v}
+        for t, row in zip(TIMES, values)
+        for code, v in zip("ABC", row)
+    ]
+    return pd.DataFrame(rows)
+
+
+def _on_station(code):
+    row = STATIONS.loc[STATIONS["codi_estacio"] == code]
+    return row[["latitud", "longitud", "altitud"]].reset_index(drop=True)
+
+
+def test_idw_matches_manual_weights():
+    readings = _readings([[1.0, 2.0, 3.0]] * 3)
+    targets = pd.DataFrame({"latitud": [41.05], "longitud": [2.01]})
+
+    result = xptsi.interpolate_to_points(readings, STATIONS, targets)
+
+    dist = np.array([
+        xptsi._utils.haversine_km(41.05, 2.01, lat, lon)
+        for lat, lon in zip(STATIONS["latitud"], STATIONS["longitud"])
+    ])
+    weights = 1 / dist**2
+    expected = (weights * [1.0, 2.0, 3.0]).sum() / weights.sum()
+    np.testing.assert_allclose(result[0].to_numpy(), expected)
+
+
+def test_target_on_station_takes_its_value_and_falls_back_when_missing():
+    readings = _readings([[1.0, 2.0, 3.0], [1.0, np.nan, 3.0], [1.0, 2.0, 3.0]])
+
+    result = xptsi.interpolate_to_points(readings, STATIONS, _on_station("B"))[0].to_numpy()
+
+    assert result[0] == result[2] == 2.0
+    # B is missing: the remaining stations are used instead of returning NaN
+    assert 1.0 < result[1] < 3.0
+
+
+def test_nearest_falls_back_to_next_station_that_reported():
+    readings = _readings([[1.0, 2.0, 3.0], [np.nan, 2.0, 3.0], [np.nan, np.nan, 3.0]])
+    targets = pd.DataFrame({"latitud": [40.99], "longitud": [2.0]})
+
+    result = xptsi.interpolate_to_points(readings, STATIONS, targets, method="nearest")
+
+    assert result[0].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_nearest_k_uses_k_reporting_stations():
+    readings = _readings([[1.0, 2.0, 3.0], [np.nan, 2.0, 3.0]] + [[1.0, 2.0, 3.0]])
+    targets = pd.DataFrame({"latitud": [40.99], "longitud": [2.0]})
+
+    result = xptsi.interpolate_to_points(readings, STATIONS, targets, method="nearest", k=2)
+
+    assert result[0].tolist() == [1.5, 2.5, 1.5]
+
+
+def test_lapse_rate_restores_target_altitude():
+    # Values follow the lapse rate exactly, so any weighting gives the same result
+    readings = _readings([[10.0, 6.75, 3.5]] * 3)
+    targets = pd.DataFrame({"latitud": [41.2], "longitud": [2.1], "altitud": [200.0]})
+
+    result = xptsi.interpolate_to_points(readings, STATIONS, targets, lapse_rate_per_km=-6.5)
+
+    np.testing.assert_allclose(result[0].to_numpy(), 10.0 - 6.5 * 0.2)
+
+
+def test_lapse_rate_requires_altitudes():
+    readings = _readings([[1.0, 2.0, 3.0]] * 3)
+    targets = pd.DataFrame({"latitud": [41.2], "longitud": [2.1]})
+
+    with pytest.raises(ValueError, match="'altitud' column in targets"):
+        xptsi.interpolate_to_points(readings, STATIONS, targets, lapse_rate_per_km=-6.5)
+    with pytest.raises(ValueError, match="'altitud' column in stations"):
+        xptsi.interpolate_to_points(
+            readings, STATIONS.drop(columns="altitud"), _on_station("A"), lapse_rate_per_km=-6.5
+        )
+    with pytest.raises(ValueError, match="grid_altitudes"):
+        xptsi.interpolate_to_grid(readings, STATIONS, 41.0, 41.3, 1.9, 2.1, 3, 3, lapse_rate_per_km=-6.5)
+
+
+def test_lapse_rate_warns_about_stations_without_altitude(caplog):
+    stations = STATIONS.assign(altitud=[0.0, np.nan, 1000.0])
+    readings = _readings([[10.0, 6.75, 3.5]] * 3)
+
+    with caplog.at_level(logging.WARNING, logger="xemapytools.spatial_interpolation"):
+        result = xptsi.interpolate_to_points(readings, stations, _on_station("B"), lapse_rate_per_km=-6.5)
+
+    assert "1 stations without altitude: ['B']" in caplog.text
+    np.testing.assert_allclose(result[0].to_numpy(), 6.75)
+
+
+def test_grid_shape():
+    readings = _readings([[1.0, 2.0, 3.0]] * 3)
+
+    times, lats, lons, values = xptsi.interpolate_to_grid(readings, STATIONS, 41.0, 41.3, 1.9, 2.1, 4, 5)
+
+    assert len(times) == 3 and lats.shape == (4,) and lons.shape == (5,)
+    assert values.shape == (3, 4, 5)
+    assert np.nanmin(values) >= 1.0 and np.nanmax(values) <= 3.0
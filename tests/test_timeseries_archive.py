@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import xemapytools.timeseries_archive as xptta
+
+
+def _readings(periods: int = 48) -> pd.DataFrame:
+    frames = []
+    for i, (station, variable) in enumerate([("A", "32"), ("A", "40"), ("B", "32")]):
+        times = pd.date_range("2024-01-01", periods=periods, freq="30min", tz="UTC")
+        frames.append(pd.DataFrame({
+            "codi_estacio": station,
+            "codi_variable": variable,
+            "data_lectura": times,
+            "valor_lectura": np.arange(periods, dtype=float) + 100 * i,
+        }))
+    # Shuffled, so the archive has to sort each series
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+
+def test_round_trip(tmp_path):
+    df = _readings()
+    xptta.write_timeseries_archive(df, tmp_path / "archive")
+    archive = xptta.open_timeseries_archive(tmp_path / "archive")
+
+    assert len(archive.index) == 3
+    assert ("A", "40") in archive and ("B", 40) not in archive
+    for (station, variable), expected in df.groupby(["codi_estacio", "codi_variable"]):
+        result = archive.read_dataframe(station, variable)
+        expected = expected.sort_values("data_lectura").reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    times, values = archive.read("B", 32)
+    assert times.dtype == np.dtype("datetime64[ns]")
+    assert not values.flags.writeable
+    with pytest.raises(KeyError):
+        archive.read("C", "32")
+
+
+def test_window_slicing(tmp_path):
+    xptta.write_timeseries_archive(_readings(), tmp_path)
+    archive = xptta.open_timeseries_archive(tmp_path)
+
+    # Both bounds are inclusive, naive bounds are UTC
+    times, values = archive.read("A", "40", "2024-01-01 01:00", "2024-01-01 02:00")
+    assert values.tolist() == [102.0, 103.0, 104.0]
+    assert times[0] == np.datetime64("2024-01-01T01:00")
+
+    _, values = archive.read("A", "40", start=pd.Timestamp("2024-01-01 23:00", tz="Europe/Madrid"))
+    assert values.tolist() == [144.0, 145.0, 146.0, 147.0]
+    _, values = archive.read("A", "32", end="2024-01-01 00:30")
+    assert values.tolist() == [0.0, 1.0]
+    _, values = archive.read("A", "32", start="2025-01-01")
+    assert len(values) == 0
+
+
+def test_empty_archive(tmp_path):
+    xptta.write_timeseries_archive(_readings().iloc[:0], tmp_path)
+    archive = xptta.open_timeseries_archive(tmp_path)
+    assert len(archive.index) == 0 and ("A", "32") not in archive
+
+
+def test_overwrite(tmp_path):
+    xptta.write_timeseries_archive(_readings(), tmp_path)
+    with pytest.raises(FileExistsError):
+        xptta.write_timeseries_archive(_readings(), tmp_path, overwrite=False)
+    with pytest.raises(FileNotFoundError):
+        xptta.open_timeseries_archive(tmp_path / "missing")
+
+
+def test_rewrite_does_not_affect_open_readers(tmp_path):
+    xptta.write_timeseries_archive(_readings(48), tmp_path)
+    old = xptta.open_timeseries_archive(tmp_path)
+
+    xptta.write_timeseries_archive(_readings(4), tmp_path)
+    new = xptta.open_timeseries_archive(tmp_path)
+
+    # The old handle keeps a consistent view of the data it opened
+    assert old.read("B", "32")[1].tolist() == list(np.arange(48) + 200.0)
+    assert new.read("B", "32")[1].tolist() == [200.0, 201.0, 202.0, 203.0]
+    # Only the published data directory is kept
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["CURRENT", xptta._read_current(tmp_path)]